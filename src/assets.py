@@ -1,3 +1,7 @@
+from functools import lru_cache
+from io import BytesIO
+
+import wx
 from wx.lib.embeddedimage import PyEmbeddedImage
 
 icons8_translation_50 = PyEmbeddedImage(
@@ -21,3 +25,9 @@ icons8_translation_50 = PyEmbeddedImage(
     b"Pp5rYkF32X1DDIPJ5+FFfyJRMP3GvSSNGP1lQpB0P2ODnaIZ+UHJZkJMYz9jmy7HNcx0iZLW"
     b"fsYkTYsJ3b9J/R/4C673TQnRnTmBAAAAAElFTkSuQmCC"
 )
+
+
+@lru_cache(maxsize=1)
+def icon_bitmap():
+    """Decoded translation icon, built once and shared by every window."""
+    return wx.Bitmap(wx.Image(BytesIO(icons8_translation_50.GetData())))
@@ -142,31 +142,40 @@ def extract_from_dir(
     if options_map is None:
         options_map = {}
 
-    directories = [os.path.join(dirname, item) for item in os.listdir(dirname)]
-    directories = [item for item in directories if os.path.isdir(item)]
+    for item in find_package_files(dirname):
+        for message_tuple in check_and_call_extract_file(
+            item,
+            method_map,
+            options_map,
+            callback,
+            keywords,
+            comment_tags,
+            strip_comment_tags,
+            dirpath=dirname,
+        ):
+            yield message_tuple
+
+
+def find_package_files(dirname):
+    """Yields the paths of the ``.py`` files within the python packages found in
+    the subdirectories of the given directory.
+
+    :param dirname: the path to the directory to search.
+    """
+    with os.scandir(dirname) as it:
+        directories = [entry.path for entry in it if entry.is_dir()]
 
     for directory in directories:
-        items = list(os.listdir(directory))
-        if "__init__.py" not in items:
+        # scandir entries carry the directory entry type, so no extra stat.
+        with os.scandir(directory) as it:
+            entries = list(it)
+        if not any(entry.name == "__init__.py" for entry in entries):
             continue  # This is not a package.
-        items = [os.path.join(directory, item) for item in items]
-        for item in items:
-            if os.path.isdir(item):
-                directories.append(item)
-            else:
-                if not os.path.basename(item).endswith(".py"):
-                    continue
-                for message_tuple in check_and_call_extract_file(
-                    item,
-                    method_map,
-                    options_map,
-                    callback,
-                    keywords,
-                    comment_tags,
-                    strip_comment_tags,
-                    dirpath=dirname,
-                ):
-                    yield message_tuple
+        for entry in entries:
+            if entry.is_dir():
+                directories.append(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
 
 
 def check_and_call_extract_file(
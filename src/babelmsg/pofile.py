@@ -18,6 +18,14 @@ from .catalog import Catalog, Message
 from .util import _cmp, wraptext
 
 
+_ESCAPE_RE = re.compile(r'\\([\\trn"])')
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", '"': '"'}
+
+
+def _replace_escape(match):
+    return _ESCAPES[match.group(1)]
+
+
 def unescape(string: str) -> str:
     r"""Reverse `escape` the given string.
 
@@ -28,19 +36,10 @@ def unescape(string: str) -> str:
 
     :param string: the string to unescape
     """
-
-    def replace_escapes(match):
-        m = match.group(1)
-        if m == "n":
-            return "\n"
-        elif m == "t":
-            return "\t"
-        elif m == "r":
-            return "\r"
-        # m is \ or "
-        return m
-
-    return re.compile(r'\\([\\trn"])').sub(replace_escapes, string[1:-1])
+    string = string[1:-1]
+    if "\\" not in string:
+        return string
+    return _ESCAPE_RE.sub(_replace_escape, string)
 
 
 def denormalize(string: str) -> str:
@@ -1,8 +1,75 @@
-import re
+import os
 import sys
 
 from src.wxpoboy import PoboyWindow
 
+_TEMPLATE_CACHE = dict()
+
+
+def load_template(path):
+    """
+    Returns the lines of the template file at path, cached by path and modification time.
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as template:
+        lines = tuple(template.readlines())
+    # One entry per path, a changed template replaces its stale lines.
+    _TEMPLATE_CACHE[key] = (mtime, lines)
+    return lines
+
+
+def split_header(lines):
+    """
+    Splits po lines into the header, the first run of non-blank lines, and the remaining lines.
+    """
+    for index, line in enumerate(lines):
+        if not line.strip():
+            return lines[:index], lines[index:]
+    return lines, lines[:0]
+
+
+def parse_events(lines):
+    """
+    Yields (kind, payload, line) per po line, kind is "id", "str", "cont" or "other".
+    """
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('msgid "'):
+            yield "id", stripped[7:-1], line
+        elif stripped.startswith('msgstr "'):
+            yield "str", stripped[8:-1], line
+        elif stripped.startswith('"'):
+            yield "cont", stripped[1:-1], line
+        else:
+            yield "other", None, line
+
+
+def fold_events(lines):
+    """
+    Folds continuation lines into the preceding msgid or msgstr.
+    Yields (kind, text, block), block being the original lines.
+    """
+    kind = None
+    text = None
+    block = None
+    for event, payload, line in parse_events(lines):
+        if event == "cont" and kind is not None:
+            if text is not None:
+                text += payload
+            block.append(line)
+            continue
+        if kind is not None:
+            yield kind, text, block
+        if event == "cont":
+            event, payload = "other", None
+        kind, text, block = event, payload, [line]
+    if kind is not None:
+        yield kind, text, block
+
 
 def plugin(kernel, lifecycle):
     if getattr(sys, "frozen", False):
@@ -47,119 +114,42 @@ def plugin(kernel, lifecycle):
                 channel(
                     "Cannot update English since it is the default language and has no file"
                 )
-            keys = dict()
-            translations = open(
+            with open(
                 "./locale/%s/LC_MESSAGES/meerk40t.po" % data, "r", encoding="utf-8"
-            )
+            ) as translations:
+                translation_header, translation_body = split_header(
+                    translations.readlines()
+                )
 
-            file_lines = translations.readlines()
-            key = None
-            index = 0
-            translation_header = []
-            while index < len(file_lines):
-                # Header is defined as the first batch of uninterrupted lines in the file.
-                try:
-                    if file_lines[index]:
-                        translation_header.append(file_lines[index])
-                    else:
-                        break
-                    index += 1
-                except IndexError:
-                    break
-
-            while index < len(file_lines):
-                try:
-                    # Find msgid and all multi-lined message ids
-                    if re.match('msgid "(.*)"', file_lines[index]):
-                        m = re.match('msgid "(.*)"', file_lines[index])
-                        key = m.group(1)
-                        index += 1
-                        if index >= len(file_lines):
-                            break
-                        while re.match('^"(.*)"$', file_lines[index]):
-                            m = re.match('^"(.*)"$', file_lines[index])
-                            key += m.group(1)
-                            index += 1
-
-                    # find all message strings and all multi-line message strings
-                    if re.match('msgstr "(.*)"', file_lines[index]):
-                        m = re.match('msgstr "(.*)"', file_lines[index])
-                        value = [file_lines[index]]
-                        if len(key) > 0:
-                            keys[key] = value
-                        index += 1
-                        while re.match('^"(.*)"$', file_lines[index]):
-                            value.append(file_lines[index])
-                            if len(key) > 0:
-                                keys[key] = value
-                            index += 1
-                    index += 1
-                except IndexError:
-                    break
-
-            template = open("./locale/messages.po", "r", encoding="utf-8")
-            lines = []
-
-            file_lines = list(template.readlines())
-            index = 0
-            template_header = []
-            while index < len(file_lines):
-                # Header is defined as the first batch of uninterrupted lines in the file.
-                # We read the template header but do not use them.
-                try:
-                    if file_lines[index]:
-                        template_header.append(file_lines[index])
-                    else:
-                        break
-                    index += 1
-                except IndexError:
-                    break
+            # Map each msgid to the msgstr lines of the translation.
+            keys = dict()
+            key = ""
+            for kind, text, block in fold_events(translation_body):
+                if kind == "id":
+                    key = text
+                elif kind == "str" and key:
+                    keys[key] = block
+
+            # We read the template header but do not use it.
+            template_header, template_body = split_header(
+                load_template("./locale/messages.po")
+            )
 
             # Lines begins with the translation's header information.
-            lines.extend(translation_header)
-            while index < len(file_lines):
-                try:
-                    # Attempt to locate message id
-                    if re.match('msgid "(.*)"', file_lines[index]):
-                        lines.append(file_lines[index])
-                        m = re.match('msgid "(.*)"', file_lines[index])
-                        key = m.group(1)
-                        index += 1
-                        while re.match('^"(.*)"$', file_lines[index]):
-                            lines.append(file_lines[index])
-                            key += m.group(1)
-                            index += 1
-                except IndexError:
-                    pass
-                try:
-                    # Attempt to locate message string
-                    if re.match('msgstr "(.*)"', file_lines[index]):
-                        if key in keys:
-                            lines.extend(keys[key])
-                            index += 1
-                            while re.match('^"(.*)"$', file_lines[index]):
-                                index += 1
-                        else:
-                            lines.append(file_lines[index])
-                            index += 1
-                            while re.match('^"(.*)"$', file_lines[index]):
-                                lines.append(file_lines[index])
-                                index += 1
-                except IndexError:
-                    pass
-                try:
-                    # We append any line if it wasn't fully read by msgid and msgstr readers.
-                    lines.append(file_lines[index])
-                    index += 1
-                except IndexError:
-                    break
+            lines = list(translation_header)
+            key = ""
+            for kind, text, block in fold_events(template_body):
+                if kind == "id":
+                    key = text
+                elif kind == "str" and key in keys:
+                    lines.extend(keys[key])
+                    continue
+                lines.extend(block)
 
             filename = "meerk40t.update"
             channel("writing %s" % filename)
-            import codecs
-
-            template = codecs.open(filename, "w", "utf8")
-            template.writelines(lines)
+            with open(filename, "w", encoding="utf-8", newline="") as update:
+                update.writelines(lines)
 
         try:
             kernel.register("window/Translate", PoboyWindow)
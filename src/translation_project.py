@@ -1,17 +1,68 @@
 import os
+import sys
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from babelmsg import mofile
 from src.utils import (
-    HEADER,
     TEMPLATE,
+    compile_mo,
     generate_template_from_python_package,
     load,
     save,
 )
 
 
+def _compile(job):
+    filename, catalog = job
+    compile_mo(catalog, filename)
+
+
+def _missing(template_messages, messages):
+    """
+    Yields the (key, message) pairs of the template missing from messages, in template order.
+    """
+    missing = template_messages.keys() - messages.keys()
+    if not missing:
+        return
+    for key, message in template_messages.items():
+        if key in missing and not (type(key) is str and key.isspace()):
+            yield key, message
+
+
+def _intern_messages(messages):
+    """
+    Rebuild messages with interned msgid keys and ids.
+    Sets _id, the id setter would flag every message modified.
+    """
+    interned = OrderedDict()
+    for key, message in messages.items():
+        if type(key) is str:
+            key = sys.intern(key)
+        if type(message._id) is str:
+            message._id = sys.intern(message._id)
+        interned[key] = message
+    return interned
+
+
+def _intern_catalog(catalog):
+    """
+    Interns the msgids of catalog, shared by every locale's catalog.
+    """
+    catalog._messages = _intern_messages(catalog._messages)
+    catalog.obsolete = _intern_messages(catalog.obsolete)
+
+
+def _run_parallel(function, jobs):
+    """
+    Run function over jobs on a thread pool, raising the first error encountered.
+    """
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+        list(executor.map(function, jobs))
+
+
 class TranslationProject:
     """
     Translation Project is the project class it stores the local sources directory the locale directory should be
@@ -44,32 +95,27 @@ class TranslationProject:
         translate.filename = self.catalog_file.format(
             locale=str(locale), domain=str(domain), language=str(language)
         )
+        translate.modified = True
         self.catalogs[locale] = translate
-        self.save(translate)
+        save(translate)
 
     def compile_all(self):
-        for c in self.catalogs:
-            if c == TEMPLATE:
+        jobs = []
+        for key, catalog in self.catalogs.items():
+            if key == TEMPLATE:
                 continue  # We do not compile template objects.
-            catalog = self.catalogs[c]
             filename = catalog.filename
             if filename.endswith(".po"):
                 filename = filename[:-3]
             filename += ".mo"
-            with open(filename, "wb") as save:
-                mofile.write_mo(save, catalog)
+            jobs.append((filename, catalog))
+        _run_parallel(_compile, jobs)
 
     def save_all(self):
-        for c in self.catalogs:
-            catalog = self.catalogs[c]
-            save(catalog)
-
-    def save(self, catalog):
-        save(catalog)
+        _run_parallel(save, list(self.catalogs.values()))
 
     def save_locale(self, locale: str):
-        catalog = self.catalogs[locale]
-        self.save(catalog)
+        save(self.catalogs[locale])
 
     def load(self, filename, locale=None):
         catalog = load(filename)
@@ -79,13 +125,36 @@ class TranslationProject:
         if self.directory is None:
             raise FileNotFoundError
         locale_directory = os.path.join(self.directory, "locale")
-        for path, dirs, files in os.walk(locale_directory):
-            for file in files:
-                if file.endswith(".po"):
-                    basedir = os.path.split(os.path.relpath(path, locale_directory))[0]
-                    self.load(os.path.join(path, file), locale=basedir)
-                if file.endswith(".pot"):
-                    self.load(os.path.join(path, file), locale=TEMPLATE)
+        base_length = len(locale_directory) + 1
+        files = []
+        directories = [locale_directory]
+        while directories:
+            path = directories.pop()
+            subdirectories = []
+            with os.scandir(path) as it:
+                for entry in it:
+                    # Directory entries carry their type, no extra stat() needed.
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                        continue
+                    file = entry.name
+                    if file[-3:] == ".po":
+                        # Walked paths extend locale_directory, slice rather than relpath.
+                        basedir = path[base_length:].rpartition(os.sep)[0]
+                        files.append((entry.path, basedir))
+                    elif file[-4:] == ".pot":
+                        files.append((entry.path, TEMPLATE))
+            # Reversed, so directories are visited in listing order like os.walk.
+            directories.extend(reversed(subdirectories))
+        if not files:
+            return
+        # Each file parses into an independent catalog, read them concurrently.
+        workers = min(32, (os.cpu_count() or 1) * 4, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            catalogs = executor.map(load, [filename for filename, locale in files])
+            for (filename, locale), catalog in zip(files, catalogs):
+                _intern_catalog(catalog)
+                self.catalogs[locale] = catalog
 
     def babel_update(
         self,
@@ -97,8 +166,8 @@ class TranslationProject:
         if template is None:
             return
 
-        for key, catalog in self.catalogs.items():
-            if key == TEMPLATE:
+        for catalog in self.catalogs.values():
+            if catalog is template:
                 continue  # Cannot update the template
             catalog.update(
                 template,
@@ -106,6 +175,7 @@ class TranslationProject:
                 update_header_comment=update_header_comment,
                 keep_user_comments=keep_user_comments,
             )
+            catalog.modified = True
 
     def babel_extract(self):
         new_template = generate_template_from_python_package(self.directory)
@@ -113,56 +183,61 @@ class TranslationProject:
         if template is not None:
             new_template.difference(template)
             new_template.properties_of(template)
+        new_template.modified = True
         self.catalogs[TEMPLATE] = new_template
 
     def calculate_updates(self):
         template = self.catalogs.get(TEMPLATE)
         if template is None:
             return
-        for message in template:
-            msgid = str(message.id)
-            name = msgid.strip()
-            if name == HEADER:
+        template_messages = template._messages
+        for catalog in self.catalogs.values():
+            if catalog is template:
                 continue
-            for catalog in self.catalogs.values():
-                if msgid not in catalog._messages:
-                    catalog.new[msgid] = message.clone()
+            new = catalog.new
+            for key, message in _missing(template_messages, catalog._messages):
+                new[key] = message.clone()
 
     def perform_updates(self):
         for catalog in self.catalogs.values():
-            catalog._messages.update(catalog.new)
-            catalog.new.clear()
+            new = catalog.new
+            if not new:
+                continue
+            catalog._messages.update(new)
+            new.clear()
+            catalog.modified = True
 
     def delete_equals(self):
         for catalog in self.catalogs.values():
-            for message in catalog:
-                if message.id == message.string:
+            for message in catalog._messages.values():
+                string = message.string
+                if string and message.id == string:
                     message.string = None
 
     def get_orphans(self, catalog):
         template = self.catalogs[TEMPLATE]
         if template is None:
             return
-        for m in catalog._messages:
-            message = catalog._messages[m]
-            msgid = str(message.id)
-            name = msgid.strip()
-            if name == HEADER:
-                continue
-            if msgid not in template._messages:
+        template_messages = template._messages
+        for message in catalog._messages.values():
+            mid = message.id
+            msgid = mid if type(mid) is str else str(mid)
+            if not msgid or msgid.isspace():
+                continue  # HEADER
+            if msgid not in template_messages:
                 yield message
 
     def mark_all_orphans_obsolete(self):
         template = self.catalogs[TEMPLATE]
         if template is None:
             return
-        for message in template:
-            msgid = str(message.id)
-            name = msgid.strip()
-            if name == HEADER:
+        template_messages = template._messages
+        for catalog in self.catalogs.values():
+            if catalog is template:
                 continue
-            for catalog in self.catalogs.values():
-                if msgid not in catalog._messages:
-                    new_message = message.clone()
-                    catalog.obsolete[msgid] = new_message
-                    new_message.modified = True
+            obsolete = catalog.obsolete
+            for key, message in _missing(template_messages, catalog._messages):
+                new_message = message.clone()
+                # Keyed by msgid, as read_po keys obsolete messages.
+                obsolete[message.id] = new_message
+                new_message.modified = True
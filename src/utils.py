@@ -1,63 +1,149 @@
+import os
 import re
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from copy import copy
 from difflib import get_close_matches
+from hashlib import blake2b
+from io import BytesIO
+from math import ceil, floor
 
-from babelmsg import Catalog, extract, mofile, pofile
+from babelmsg import Catalog, Message, extract, mofile, pofile
+from babelmsg.util import distinct
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
 
 PUNCTUATION = (".", "?", "!", ":", ";")
+PUNCTUATION_SET = frozenset(PUNCTUATION)
 TEMPLATE = ""
 HEADER = ""
 PRINTF_RE = re.compile(
-    r"(%(?:(?:[-+0#]{0,5})(?:\d+|\*)?(?:\.(?:\d+|\*))?(?:h|l|ll|w|I|I32|I64)?[cCdiouxXeEfgGaAnpsSZ])|%%)"
+    r"(%(?:(?:[-+0#]{0,5})(?:\d+|\*)?(?:\.(?:\d+|\*))?"
+    r"(?:h|l|ll|w|I|I32|I64)?[cCdiouxXeEfgGaAnpsSZ])|%%)",
+    re.ASCII,
 )
+# Bound finder for printf placeholders, e.g. scan_printf("%d of %s") == ["%d", "%s"].
+scan_printf = PRINTF_RE.findall
+
+
+def is_modified(catalog):
+    """
+    Whether the catalog differs from what was last loaded or saved to its file.
+    """
+    if catalog.modified:
+        return True
+    for messages in (catalog._messages, catalog.obsolete):
+        for message in messages.values():
+            if message.modified:
+                return True
+    return False
+
+
+def write_replace(filename, data):
+    """
+    Write data beside filename then swap it in, readers never see a partially written file.
+    """
+    temporary = filename + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, filename)
+
+
+def compile_mo(catalog, filename):
+    """
+    Write the compiled catalog to filename, unless identical bytes were last written there.
+    """
+    buffer = BytesIO()
+    mofile.write_mo(buffer, catalog)
+    data = buffer.getvalue()
+    digest = (filename, blake2b(data, digest_size=16).digest())
+    if getattr(catalog, "_last_mo_hash", None) == digest and os.path.exists(filename):
+        return
+    write_replace(filename, data)
+    catalog._last_mo_hash = digest
 
 
 def save(catalog, write_mo=True, filename=None):
+    rewrite = True
     if filename is None:
         filename = catalog.filename
-    if filename is None:
-        raise FileNotFoundError
-    with open(filename, "wb") as save:
-        pofile.write_po(save, catalog, original_header=False)
-    if filename.endswith(".pot") or not write_mo:
-        return
-    if filename.endswith(".po"):
-        filename = filename[:-3]
-    filename += ".mo"
-    with open(filename, "wb") as save:
-        mofile.write_mo(save, catalog)
+        if filename is None:
+            raise FileNotFoundError
+        # An unchanged catalog's po file is current, its mo file may still be missing.
+        rewrite = is_modified(catalog) or not os.path.exists(filename)
+    if rewrite:
+        # write_po emits many small writes, collect them and write the file once.
+        buffer = BytesIO()
+        pofile.write_po(buffer, catalog, original_header=False)
+        write_replace(filename, buffer.getvalue())
+    if not filename.endswith(".pot") and write_mo:
+        mo_filename = filename[:-3] if filename.endswith(".po") else filename
+        compile_mo(catalog, mo_filename + ".mo")
+    if filename == catalog.filename:
+        catalog.modified = False
 
 
 def load(filename):
-    with open(filename, "r", encoding="utf-8") as file:
+    with open(filename, "r", encoding="utf-8", buffering=1 << 20) as file:
         catalog = pofile.read_po(file, filename=filename)
         return catalog
 
 
 def generate_template_from_python_package(sources_directory, strip_comment_tags=False):
-    template = Catalog()
-    for filename, lineno, message, comments, context in extract.extract_from_dir(
-        sources_directory,
-        strip_comment_tags=strip_comment_tags,
-    ):
-        template.add(
-            message,
+    # Gather every occurrence of a message first, so each is added to the catalog once.
+    messages = dict()
+    for filepath in extract.find_package_files(sources_directory):
+        extracted = extract.check_and_call_extract_file(
+            filepath,
+            extract.DEFAULT_MAPPING,
+            {},
             None,
-            [(filename, lineno)],
-            auto_comments=comments,
-            context=context,
+            extract.DEFAULT_KEYWORDS,
+            (),
+            strip_comment_tags,
+            dirpath=sources_directory,
         )
+        for filename, lineno, message, comments, context in extracted:
+            plural = isinstance(message, (list, tuple))
+            key = (message[0] if plural else message, context)
+            entry = messages.get(key)
+            if entry is None:
+                messages[key] = [message, [(filename, lineno)], list(comments)]
+                continue
+            if plural and not isinstance(entry[0], (list, tuple)):
+                entry[0] = message  # The later occurrence adds pluralization.
+            entry[1].append((filename, lineno))
+            entry[2].extend(comments)
+
+    # Every key is unique by now, fill the catalog directly rather than through add().
+    template = Catalog()
+    template._messages = OrderedDict(
+        (
+            key if context is None else (key, context),
+            Message(
+                message,
+                None,
+                list(distinct(locations)),
+                auto_comments=list(distinct(comments)),
+                context=context,
+            ),
+        )
+        for (key, context), (message, locations, comments) in messages.items()
+    )
     return template
 
 
 def obsolete_orphans(tree, catalog, panel):
     for m in list(catalog.orphans):
-        message = catalog[m]
+        message = catalog.orphans[m]
         parents = [tree.GetItemParent(item) for item in message.items]
         if catalog.workflow_orphans in parents:
             message.modified = True
             catalog.obsolete[m] = message
-            del catalog[m]
+            catalog.delete(message.id, message.context)
             del catalog.orphans[m]
 
             for item in message.items:
@@ -65,17 +151,20 @@ def obsolete_orphans(tree, catalog, panel):
             tree.Delete(message.item)
 
             message.item = tree.AppendItem(
-                catalog.workflow_obsolete, m, data=(catalog, message)
+                catalog.workflow_obsolete,
+                panel.message_name(message),
+                data=(catalog, message),
             )
 
 
 def delete_orphans(tree, catalog, panel):
     for m in list(catalog.orphans):
-        message = catalog[m]
+        message = catalog.orphans[m]
         message.modified = True
+        catalog.modified = True
         for item in message.items:
             tree.Delete(item)
-        del catalog[m]
+        catalog.delete(message.id, message.context)
         del catalog.orphans[m]
 
 
@@ -87,40 +176,90 @@ def save_as_patch(tree, catalog, panel):
 
 
 def move_new_to_general(tree, catalog, panel):
-    for m in list(catalog.new):
-        message = catalog.new[m]
+    for key in list(catalog.new):
+        # Keys are _messages keys, (msgid, context) for a message with a context.
+        message = catalog.new.pop(key)
         message.modified = True
-        del catalog.new[m]
-        catalog[m] = message
+        catalog[message.id] = message
 
         for item in message.items:
             tree.Delete(item)
         tree.Delete(message.item)
 
-        message.item = tree.AppendItem(catalog.workflow_all, m, data=(catalog, message))
+        message.item = tree.AppendItem(
+            catalog.workflow_all, panel.message_name(message), data=(catalog, message)
+        )
         panel.message_revalidate(catalog, message)
 
 
+def closest_match(word, possibilities, cutoff=0.6):
+    """
+    Best match for word scoring at least cutoff, or None. Uses rapidfuzz when installed.
+    """
+    if process is not None:
+        result = process.extractOne(
+            word, possibilities, scorer=fuzz.ratio, score_cutoff=cutoff * 100
+        )
+        return result[0] if result is not None else None
+    matches = get_close_matches(word, possibilities, 1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+def closest_matches(words, possibilities, cutoff=0.6):
+    """
+    closest_match for each of the words, as one batch when rapidfuzz is installed.
+    """
+    if process is not None and words and possibilities:
+        score_cutoff = cutoff * 100
+        try:
+            scores = process.cdist(
+                words,
+                possibilities,
+                scorer=fuzz.ratio,
+                score_cutoff=score_cutoff,
+                workers=-1,
+            )
+        except ImportError:
+            pass  # cdist returns a numpy matrix, without numpy match one at a time.
+        else:
+            matches = []
+            for row, best in zip(scores, scores.argmax(axis=1)):
+                score = row[best]
+                matches.append(
+                    possibilities[best] if score and score >= score_cutoff else None
+                )
+            return matches
+    if cutoff <= 0 or not possibilities:
+        return [closest_match(word, possibilities, cutoff) for word in words]
+    # A difflib ratio is at most 2 * min(a, b) / (a + b), so lengths alone rule
+    # out most candidates. Only the band of lengths that could reach cutoff is scored.
+    by_length = sorted(possibilities, key=len)
+    lengths = [len(possibility) for possibility in by_length]
+    matches = []
+    for word in words:
+        size = len(word)
+        low = bisect_left(lengths, floor(size * cutoff / (2 - cutoff)))
+        high = bisect_right(lengths, ceil(size * (2 - cutoff) / cutoff))
+        matches.append(closest_match(word, by_length[low:high], cutoff))
+    return matches
+
+
 def fuzzy_match(tree, catalog, panel):
+    # Obsolete entries take precedence over orphans sharing the same msgid.
+    pool = {**catalog.orphans, **catalog.obsolete}
     candidates = list(catalog.orphans)
     candidates.extend(catalog.obsolete)
 
-    for new_message in catalog.new.values():
-        matches = get_close_matches(new_message.id, candidates, 1, cutoff=0.85)
-        if matches:
-            match = matches[0]
-            cur_message = None
-            try:
-                cur_message = catalog.orphans[match]
-            except KeyError:
-                pass
-            try:
-                cur_message = catalog.obsolete[match]
-            except KeyError:
-                pass
+    new_messages = list(catalog.new.values())
+    matches = closest_matches(
+        [message.id for message in new_messages], candidates, cutoff=0.85
+    )
+    for new_message, match in zip(new_messages, matches):
+        if match is not None:
+            cur_message = pool.get(match)
             if not cur_message:
                 continue
             new_message.string = copy(cur_message.string)
             new_message.fuzzy = True
             new_message.modified = True
-            panel.message_revalidate(catalog, new_message)
+            panel.schedule_revalidate(catalog, new_message)
@@ -1,14 +1,17 @@
+import logging
 import os
 import sys
+import threading
+from functools import lru_cache
+from types import MappingProxyType
 
 import wx
 
-from assets import icons8_translation_50
+from assets import icon_bitmap
 from src.translation_project import TranslationProject
 from src.utils import (
     HEADER,
-    PRINTF_RE,
-    PUNCTUATION,
+    PUNCTUATION_SET,
     TEMPLATE,
     delete_orphans,
     fuzzy_match,
@@ -16,12 +19,34 @@ from src.utils import (
     obsolete_orphans,
     save,
     save_as_patch,
+    scan_printf,
 )
 
 _ = wx.GetTranslation
+logger = logging.getLogger(__name__)
 
 
-INTERFACE = {
+@lru_cache(maxsize=32)
+def _font(size):
+    return wx.Font(
+        size,
+        wx.FONTFAMILY_DEFAULT,
+        wx.FONTSTYLE_NORMAL,
+        wx.FONTWEIGHT_NORMAL,
+        0,
+        "Segoe UI",
+    )
+
+
+def _change_value(ctrl, value):
+    """
+    Replace the text of ctrl only if it differs, without emitting EVT_TEXT.
+    """
+    if ctrl.GetValue() != value:
+        ctrl.ChangeValue(value)
+
+
+_interface = {
     "new": {
         "description": """New messages are those items found in the template but not found Portable Object file.
 
@@ -123,6 +148,16 @@ Note: All includes only those messages which are actively in the catalog. This w
         "commands": [],
     },
 }
+# Frozen as {info: (description, ((name, command), ...))} for lookups on every selection.
+INTERFACE = MappingProxyType(
+    {
+        info: (
+            entry["description"],
+            tuple((cmd["name"], cmd["command"]) for cmd in entry["commands"]),
+        )
+        for info, entry in _interface.items()
+    }
+)
 
 
 supported_languages = (
@@ -137,6 +172,28 @@ supported_languages = (
 
 
 class TranslationPanel(wx.Panel):
+    # In layout order, panels built on first show are appended to their sizer in this order.
+    _PANELS = (
+        "panel_message_single",
+        "panel_catalog",
+        "panel_statistics",
+        "panel_file_information",
+        "panel_template",
+        "panel_template_file_information",
+        "panel_project",
+        "panel_info",
+    )
+    # The panels shown for each kind of tree selection.
+    _STATES = {
+        "project": frozenset(("panel_project",)),
+        "info": frozenset(("panel_info",)),
+        "message": frozenset(("panel_message_single",)),
+        "catalog": frozenset(
+            ("panel_catalog", "panel_statistics", "panel_file_information")
+        ),
+        "template": frozenset(("panel_template", "panel_template_file_information")),
+    }
+
     def __init__(self, *args, **kwds):
         # begin wxGlade: TranslationPanel.__init__
         kwds["style"] = kwds.get("style", 0) | wx.WANTS_CHARS
@@ -145,6 +202,18 @@ class TranslationPanel(wx.Panel):
         self.project = TranslationProject()
 
         self.do_not_update = False
+        self.header_label = _("HEADER")
+        # (catalog, msgid, msgstr, fuzzy) -> sections the message belongs in.
+        self._classify_cache = dict()
+        self._rebuild_call = None
+        self._pending_revalidate = dict()  # id(message) -> (catalog, message)
+        # Unexpanded section item -> {id(message): (name, message)} still to be added.
+        self._pending_sections = dict()
+        # Names of the shown panels, panels are shown as they are created.
+        self._current_panels = frozenset(("panel_message_single", "panel_project"))
+        self._last_selection = None  # (id(catalog), info) last shown in the panels.
+        self._next_selectable = None  # Next sibling of the selected tree item.
+        self._catalog_index = dict()  # id(catalog) -> locale key in project.catalogs
 
         main_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
@@ -167,35 +236,30 @@ class TranslationPanel(wx.Panel):
         sizer_catalog_statistics = wx.BoxSizer(wx.VERTICAL)
         main_sizer.Add(sizer_catalog_statistics, 3, wx.EXPAND, 0)
 
-        self.panel_catalog = CatalogPanel(self, wx.ID_ANY, translation_panel=self)
-        sizer_catalog_statistics.Add(self.panel_catalog, 3, wx.EXPAND, 0)
-
-        self.panel_statistics = StatisticsPanel(self, wx.ID_ANY, translation_panel=self)
-        sizer_catalog_statistics.Add(self.panel_statistics, 3, wx.EXPAND, 0)
-
-        self.panel_file_information = FileInformationPanel(
-            self, wx.ID_ANY, translation_panel=self
-        )
-        sizer_catalog_statistics.Add(self.panel_file_information, 3, wx.EXPAND, 0)
-
         sizer_template_statistics = wx.BoxSizer(wx.VERTICAL)
         main_sizer.Add(sizer_template_statistics, 3, wx.EXPAND, 0)
 
-        self.panel_template = TemplatePanel(self, wx.ID_ANY, translation_panel=self)
-        sizer_template_statistics.Add(self.panel_template, 3, wx.EXPAND, 0)
-
-        self.panel_template_file_information = FileInformationPanel(
-            self, wx.ID_ANY, translation_panel=self
-        )
-        sizer_template_statistics.Add(
-            self.panel_template_file_information, 3, wx.EXPAND, 0
-        )
-
         self.panel_project = ProjectPanel(self, wx.ID_ANY, translation_panel=self)
         main_sizer.Add(self.panel_project, 3, wx.EXPAND, 0)
 
-        self.panel_info = InfoPanel(self, wx.ID_ANY, translation_panel=self)
-        main_sizer.Add(self.panel_info, 3, wx.EXPAND, 0)
+        # The remaining panels are built the first time they are shown.
+        self.panel_catalog = None
+        self.panel_statistics = None
+        self.panel_file_information = None
+        self.panel_template = None
+        self.panel_template_file_information = None
+        self.panel_info = None
+        self._panel_factories = {
+            "panel_catalog": (CatalogPanel, sizer_catalog_statistics),
+            "panel_statistics": (StatisticsPanel, sizer_catalog_statistics),
+            "panel_file_information": (FileInformationPanel, sizer_catalog_statistics),
+            "panel_template": (TemplatePanel, sizer_template_statistics),
+            "panel_template_file_information": (
+                FileInformationPanel,
+                sizer_template_statistics,
+            ),
+            "panel_info": (InfoPanel, main_sizer),
+        }
 
         self.SetSizer(main_sizer)
 
@@ -212,6 +276,8 @@ class TranslationPanel(wx.Panel):
 
         self.tree.Bind(wx.EVT_TREE_SEL_CHANGED, self.on_tree_selection)
         self.tree.Bind(wx.EVT_TREE_ITEM_RIGHT_CLICK, self.on_tree_menu)
+        self.tree.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.on_tree_expanding)
+        self.Bind(wx.EVT_IDLE, self.on_idle)
 
     def _build_menu_file(self):
         wxglade_tmp_menu = wx.Menu()
@@ -241,15 +307,19 @@ class TranslationPanel(wx.Panel):
         self.open_project_directory()
 
     def on_menu_save_as_translation(self, event):
+        self.panel_message_single.flush_translation()
         self.open_save_translation_dialog()
 
     def on_menu_save_as_template(self, event):
+        self.panel_message_single.flush_translation()
         self.open_save_template_dialog()
 
     def on_menu_save_translation(self, event):
+        self.panel_message_single.flush_translation()
         self.try_save_working_file_translation()
 
     def on_menu_save_template(self, event):
+        self.panel_message_single.flush_translation()
         self.try_save_working_file_template()
 
     def _build_menu_actions(self):
@@ -266,17 +336,21 @@ class TranslationPanel(wx.Panel):
         return wxglade_tmp_menu
 
     def on_menu_action_update(self, event):
+        self.panel_message_single.flush_translation()
         with wx.BusyInfo("Updating all translations with current template."):
             self.action_update()
 
     def on_menu_action_extract(self, event):
+        self.panel_message_single.flush_translation()
         with wx.BusyInfo("Extracting sources to generate new template."):
             self.action_extract()
 
     def on_menu_action_init(self, event):
+        self.panel_message_single.flush_translation()
         self.action_init()
 
     def on_menu_action_compile(self, event):
+        self.panel_message_single.flush_translation()
         self.action_compile()
 
     def _build_menu_navigate(self):
@@ -368,7 +442,7 @@ class TranslationPanel(wx.Panel):
                 pathname += ".pot"
             catalog = self.project.catalogs[TEMPLATE]
 
-            self.project.save(catalog)
+            save(catalog)
             return pathname
 
     def open_load_translation_dialog(self):
@@ -410,10 +484,15 @@ class TranslationPanel(wx.Panel):
 
     def delete_equals(self):
         for catalog in self.project.catalogs.values():
-            for message in catalog:
-                if message.id == message.string:
-                    message.string = None
-                    self.message_revalidate(catalog, message)
+            # Find the matches in one sweep, only those need touching in the tree.
+            equals = [
+                message
+                for message in catalog._messages.values()
+                if message.string and message.id == message.string
+            ]
+            for message in equals:
+                message.string = None
+                self.schedule_revalidate(catalog, message)
 
     def move_orphans_to_obsolete(self):
         for catalog in self.project.catalogs.values():
@@ -421,7 +500,7 @@ class TranslationPanel(wx.Panel):
                 m.modified = True
                 catalog.obsolete[m.id] = m
                 del catalog.orphans[m.id]
-                self.message_revalidate(catalog, m)
+                self.schedule_revalidate(catalog, m)
 
     def action_init(self):
         dlg = wx.TextEntryDialog(
@@ -476,12 +555,47 @@ class TranslationPanel(wx.Panel):
             self.open_save_template_dialog()
 
     def tree_rebuild_tree(self):
+        # Requests arriving in quick succession are served by a single rebuild.
+        self.do_not_update = True
+        if self._rebuild_call is None:
+            self._rebuild_call = wx.CallLater(150, self.tree_rebuild_now)
+        else:
+            self._rebuild_call.Restart(150)
+
+    def tree_rebuild_now(self):
+        if self._rebuild_call is not None:
+            self._rebuild_call.Stop()
+            self._rebuild_call = None
+        # The rebuild classifies every message afresh.
+        self._pending_revalidate.clear()
         self.do_not_update = True
         with wx.BusyInfo(_("Rebuilding Tree...")):
             self._tree_rebuild()
         self.do_not_update = False
         self.tree.SelectItem(self.root)
 
+    def schedule_revalidate(self, catalog, message):
+        """
+        Revalidate the message once the event queue is idle, repeated requests collapse into one.
+        """
+        if message is not None:
+            # The message already changed, its statistics must not wait for the tree.
+            StatisticsPanel.invalidate(catalog)
+            self._pending_revalidate[id(message)] = (catalog, message)
+
+    def on_idle(self, event):
+        pending = self._pending_revalidate
+        if pending and self._rebuild_call is None:
+            self._pending_revalidate = dict()
+            tree = self.tree
+            tree.Freeze()
+            try:
+                for catalog, message in pending.values():
+                    self.message_revalidate(catalog, message)
+            finally:
+                tree.Thaw()
+        event.Skip()
+
     def _tree_build_template(self):
         tree = self.tree
         try:
@@ -495,12 +609,9 @@ class TranslationPanel(wx.Panel):
                 )
                 tree.SetItemTextColour(catalog.workflow_added, wx.GREEN)
                 for message in catalog.new.values():
-                    msgid = str(message.id)
-                    name = msgid.strip()
-                    if name == HEADER:
-                        name = _("HEADER")
-                    message.item = tree.AppendItem(
-                        catalog.workflow_added, name, data=(catalog, message)
+                    name = self.message_name(message)
+                    message.item = self._tree_append_message(
+                        catalog.workflow_added, name, catalog, message
                     )
             if len(catalog.orphans):
                 catalog.workflow_removed = tree.AppendItem(
@@ -508,20 +619,14 @@ class TranslationPanel(wx.Panel):
                 )
                 tree.SetItemTextColour(catalog.workflow_removed, wx.RED)
                 for message in catalog.orphans.values():
-                    msgid = str(message.id)
-                    name = msgid.strip()
-                    if name == HEADER:
-                        name = _("HEADER")
-                    message.item = tree.AppendItem(
-                        catalog.workflow_removed, name, data=(catalog, message)
+                    name = self.message_name(message)
+                    message.item = self._tree_append_message(
+                        catalog.workflow_removed, name, catalog, message
                     )
             for message in catalog:
-                msgid = str(message.id)
-                name = msgid.strip()
-                if name == HEADER:
-                    name = _("HEADER")
-                message.item = tree.AppendItem(
-                    catalog.item, name, data=(catalog, message)
+                name = self.message_name(message)
+                message.item = self._tree_append_message(
+                    catalog.item, name, catalog, message
                 )
             self.template = catalog
         except KeyError:
@@ -529,10 +634,11 @@ class TranslationPanel(wx.Panel):
 
     def _tree_build_catalog(self, locale, catalog):
         tree = self.tree
-        catalog.item = tree.AppendItem(self.root, locale, data=(catalog, "root"))
+        catalog_root = tree.AppendItem(self.root, locale, data=(catalog, "root"))
+        catalog.item = catalog_root
         if str(catalog.locale) != locale:
             catalog.item = tree.AppendItem(
-                catalog.item,
+                catalog_root,
                 _("%s, locale != directory") % str(catalog.locale),
                 data=(catalog, "error_catalog-locale"),
             )
@@ -593,98 +699,159 @@ class TranslationPanel(wx.Panel):
         catalog.workflow_all = tree.AppendItem(
             catalog.item, _("All"), data=(catalog, "all")
         )
+        self._find_orphans(catalog)
+        # Classify every message first, then fill each section in a single pass.
+        sections = dict()
         for message in catalog:
-            msgid = str(message.id)
-            name = msgid.strip()
-            if name == HEADER:
-                name = _("HEADER")
-            message.item = tree.AppendItem(
-                catalog.workflow_all, name, data=(catalog, message)
+            name = self.message_name(message)
+            message.item = self._tree_append_message(
+                catalog.workflow_all, name, catalog, message
             )
-            self.message_revalidate(catalog, message)
+            message.items = []
+            for parent in self.message_classify(catalog, message):
+                sections.setdefault(parent, dict())[id(message)] = (name, message)
+        # Section contents are only added once the section is first expanded.
+        for parent, entries in sections.items():
+            self._pending_sections[parent] = entries
+            tree.SetItemHasChildren(parent, True)
         for m in catalog.obsolete:
             message = catalog.obsolete[m]
-            msgid = str(message.id)
-            name = msgid.strip()
-            if name == HEADER:
+            name = self.message_name(message)
+            if name is self.header_label:
                 continue
-            message.item = tree.AppendItem(
-                catalog.workflow_obsolete, name, data=(catalog, message)
+            message.item = self._tree_append_message(
+                catalog.workflow_obsolete, name, catalog, message
             )
         for m in catalog.new:
             message = catalog.new[m]
-            msgid = str(message.id)
-            name = msgid.strip()
-            if name == HEADER:
+            name = self.message_name(message)
+            if name is self.header_label:
                 continue
-            message.item = tree.AppendItem(
-                catalog.workflow_new, name, data=(catalog, message)
+            message.item = self._tree_append_message(
+                catalog.workflow_new, name, catalog, message
             )
-            if message.item and message.item.IsOk():
-                tree.SetItemTextColour(
-                    message.item,
-                    self.color_template_translated
-                    if message.string
-                    else self.color_template,
-                )
+        # Only open the section headings, the message lists stay collapsed.
+        for item in (catalog_root, catalog.item, catalog.errors, catalog.issues):
+            tree.Expand(item)
 
-    def _tree_rebuild(self):
+    def _find_orphans(self, catalog):
+        """
+        Collect the catalog's messages which the template no longer has, once per build.
+        """
+        orphans = catalog.orphans
+        orphans.clear()
+        template = self.template
+        if template is not None:
+            messages = catalog._messages
+            if messages.keys() - template._messages.keys():
+                template_messages = template._messages
+                for key, message in messages.items():
+                    if key not in template_messages:
+                        # Keyed by msgid, as the orphan commands look them up.
+                        orphans[message.id] = message
+        catalog.orphan_ids = frozenset(orphans)
+
+    def message_name(self, message):
+        """
+        Tree label for the message, the stripped msgid is kept on the message between rebuilds.
+        """
+        msgid = message.id
+        cached = getattr(message, "display_name", None)
+        if cached is None or cached[0] is not msgid:
+            cached = message.display_name = (msgid, str(msgid).strip())
+        return cached[1] or self.header_label
+
+    def on_tree_expanding(self, event):
+        self.tree_populate_section(event.GetItem())
+        event.Skip()
+
+    def tree_populate_section(self, section):
+        """
+        Add the messages of a section which has not been expanded before.
+        """
+        entries = self._pending_sections.pop(section, None)
+        if not entries:
+            return
         tree = self.tree
-        tree.DeleteChildren(self.root)
-        self._tree_build_template()
-        for m in self.project.catalogs:
-            if m == TEMPLATE:
-                continue
-            catalog = self.project.catalogs[m]
-            self._tree_build_catalog(m, catalog)
-        tree.ExpandAllChildren(self.root)
-        self.depth_first_tree(self._tree_recolor, self.root)
-
-    def _tree_recolor(self, item):
-        catalog, info = self.tree.GetItemData(item)
-        if not isinstance(info, str):
-            if catalog.locale is None:
-                c1 = self.color_template_translated
-                c2 = self.color_template
-            else:
-                c1 = self.color_translated
-                c2 = self.color_untranslated
-            self.tree.SetItemTextColour(item, c1 if info.string else c2)
+        catalog, info = tree.GetItemData(section)
+        for name, message in entries.values():
+            message.items.append(
+                self._tree_append_message(section, name, catalog, message)
+            )
 
-    def depth_first_tree(self, funct, item):
-        (child, cookie) = self.tree.GetFirstChild(item)
-        while child.IsOk():
-            self.depth_first_tree(funct, child)
-            funct(child)
-            (child, cookie) = self.tree.GetNextChild(item, cookie)
+    def tree_populate_catalog(self, catalog):
+        """
+        Add every pending section of the catalog, commands expect all items to exist.
+        """
+        tree = self.tree
+        for section in list(self._pending_sections):
+            if tree.GetItemData(section)[0] is catalog:
+                self.tree_populate_section(section)
+
+    def _tree_rebuild(self):
+        tree = self.tree
+        # Translated once per rebuild, picks up a changed interface language.
+        self.header_label = _("HEADER")
+        # Section items are recreated, so are the classifications that name them.
+        self._classify_cache.clear()
+        self._pending_sections.clear()
+        self._last_selection = None
+        self._next_selectable = None
+        # Every change to the project's catalogs is followed by a rebuild.
+        self._catalog_index = dict()
+        for key, catalog in self.project.catalogs.items():
+            self._catalog_index[id(catalog)] = key
+            StatisticsPanel.invalidate(catalog)
+        # Suppress repaints until every item is added and coloured.
+        tree.Freeze()
+        try:
+            tree.DeleteChildren(self.root)
+            self._tree_build_template()
+            for m in self.project.catalogs:
+                if m == TEMPLATE:
+                    continue
+                catalog = self.project.catalogs[m]
+                self._tree_build_catalog(m, catalog)
+            tree.Expand(self.root)
+        finally:
+            tree.Thaw()
+
+    def _tree_append_message(self, parent, name, catalog, message):
+        """
+        Append an item for the message under parent, coloured as it is created.
+        """
+        item = self.tree.AppendItem(parent, name, data=(catalog, message))
+        self.tree.SetItemTextColour(item, self._message_colour(catalog, message))
+        return item
+
+    def _message_colour(self, catalog, message):
+        if catalog.locale is None:
+            c1 = self.color_template_translated
+            c2 = self.color_template
+        else:
+            c1 = self.color_translated
+            c2 = self.color_untranslated
+        return c1 if message.string else c2
 
     def tree_move_to_next(self):
-        t = None
-        for item in list(self.tree.GetSelections()):
-            t = item
-            break
-        if t is None:
+        t = self.tree.GetSelection()
+        if not t.IsOk():
             return
         n = self.tree.GetNextSibling(t)
+        self.panel_message_single.flush_translation()
         catalog = self.project.catalogs[self.catalog]
-        self.message_revalidate(
-            catalog, self.panel_message_single.selected_message
-        )
+        self.schedule_revalidate(catalog, self.panel_message_single.selected_message)
         if n.IsOk():
             self.tree.SelectItem(n)
 
     def tree_move_to_previous(self):
-        t = None
-        for item in list(self.tree.GetSelections()):
-            t = item
-            break
-        if t is None:
+        t = self.tree.GetSelection()
+        if not t.IsOk():
             return
         n = self.tree.GetPrevSibling(t)
+        self.panel_message_single.flush_translation()
         catalog = self.project.catalogs[self.catalog]
-        self.message_revalidate(
-            catalog, self.panel_message_single.selected_message
-        )
+        self.schedule_revalidate(catalog, self.panel_message_single.selected_message)
         if n.IsOk():
             self.tree.SelectItem(n)
 
@@ -700,6 +867,7 @@ class TranslationPanel(wx.Panel):
         :param message:
         :return:
         """
+        StatisticsPanel.invalidate(catalog)
         tree = self.tree
 
         comment = message.auto_comments
@@ -707,30 +875,35 @@ class TranslationPanel(wx.Panel):
         msgstr = message.string
         items = message.items
 
-        old_parents = []
-        for item in items:
-            old_parents.append(tree.GetItemParent(item))
+        old_parents = [tree.GetItemParent(item) for item in items]
         new_parents = self.message_classify(catalog, message)
 
-        name = msgid.strip()
-        if name == HEADER:
-            name = _("HEADER")
-
-        removing = []
-        for i, itm in enumerate(old_parents):
-            if itm not in new_parents:
-                # removing contains actual items, not parents.
-                removing.append(items[i])
-        adding = []
-        for itm in new_parents:
-            if itm not in old_parents:
-                # Adding contains parents to be added to.
-                adding.append(itm)
+        name = self.message_name(message)
+
+        old_set = set(old_parents)
+        new_set = set(new_parents)
+        # Unexpanded sections keep their entries pending, update those instead of the tree.
+        key = id(message)
+        pending = self._pending_sections
+        for section, entries in pending.items():
+            if section in new_set:
+                if key not in entries:
+                    entries[key] = (name, message)
+            else:
+                entries.pop(key, None)
+        # removing contains actual items, not parents.
+        removing = [items[i] for i, itm in enumerate(old_parents) if itm not in new_set]
+        # Adding contains parents to be added to.
+        adding = [
+            itm for itm in new_parents if itm not in old_set and itm not in pending
+        ]
         for item in removing:
-            self.tree.Delete(item)
+            if item == self._next_selectable:
+                self._next_selectable = None
+            tree.Delete(item)
             items.remove(item)
         for item in adding:
-            new_item = self.tree.AppendItem(item, name, data=(catalog, message))
+            new_item = self._tree_append_message(item, name, catalog, message)
             items.append(new_item)
 
     def message_classify(self, catalog, message):
@@ -740,155 +913,166 @@ class TranslationPanel(wx.Panel):
         :param message: message to classify.
         :return:
         """
+        msgstr = message.string
+        if isinstance(msgstr, list):
+            msgstr = tuple(msgstr)
+        key = (id(catalog), message.id, msgstr, message.fuzzy)
+        classes = self._classify_cache.get(key)
+        if classes is None:
+            classes = tuple(self._message_classify(catalog, message))
+            self._classify_cache[key] = classes
+        return classes
+
+    def _message_classify(self, catalog, message):
         classes = []
-        comment = message.auto_comments
+        append = classes.append
         msgid = message.id
         msgstr = message.string
-        items = message.items
         if msgid == HEADER:
             return classes
+        if msgid in catalog.orphan_ids:
+            append(catalog.workflow_orphans)
         if message.fuzzy:
-            classes.append(catalog.workflow_fuzzy)
+            append(catalog.workflow_fuzzy)
         if not msgstr:
-            classes.append(catalog.workflow_untranslated)
+            append(catalog.workflow_untranslated)
             return classes
-        else:
-            classes.append(catalog.workflow_translated)
-
-        template = self.template
-        if template is not None:
-            if message.id not in template._messages:
-                # Orphan
-                catalog.orphans[message.id] = message
-                classes.append(catalog.workflow_orphans)
+        append(catalog.workflow_translated)
 
         if msgid == msgstr:
-            classes.append(catalog.warning_equal)
-        if msgid[-1] != msgstr[-1]:
-            if msgid[-1] in PUNCTUATION or msgstr[-1] in PUNCTUATION:
-                classes.append(catalog.warning_end_punct)
-            if msgid[-1] == " " or msgstr[-1] == " ":
-                classes.append(catalog.warning_end_space)
-
-        p0 = list(PRINTF_RE.findall(msgid))
-        p1 = list(PRINTF_RE.findall(msgstr))
-        if len(p0) == len(p1):
-            for a, b in zip(p0, p1):
-                if a != b:
-                    classes.append(catalog.error_printf)
-                    break
-        else:
-            classes.append(catalog.error_printf)
-
-        if msgid[0].isupper() != msgstr[0].isupper():
-            classes.append(catalog.warning_start_capital)
+            append(catalog.warning_equal)
+
+        # msgstr is non-empty here, msgid may still be empty.
+        id_first = msgid[0] if msgid else ""
+        id_last = msgid[-1] if msgid else ""
+        str_first = msgstr[0]
+        str_last = msgstr[-1]
+        if id_last != str_last:
+            if id_last in PUNCTUATION_SET or str_last in PUNCTUATION_SET:
+                append(catalog.warning_end_punct)
+            if id_last == " " or str_last == " ":
+                append(catalog.warning_end_space)
+
+        # Without a "%" on either side there are no printf tokens to compare.
+        if "%" in msgid or "%" in msgstr:
+            if scan_printf(msgid) != scan_printf(msgstr):
+                append(catalog.error_printf)
+
+        if id_first.isupper() != str_first.isupper():
+            append(catalog.warning_start_capital)
         if "  " in msgstr and "  " not in msgid:
-            classes.append(catalog.warning_double_space)
+            append(catalog.warning_double_space)
         return classes
 
+    def _switch_panels(self, state):
+        """
+        Show only the panels of the state, laying out once with redraws frozen.
+        """
+        # Typing still waiting on the commit timer belongs to the message being left.
+        self.panel_message_single.flush_translation()
+        visible = self._STATES[state]
+        changed = visible ^ self._current_panels
+        if not changed:
+            return
+        self._current_panels = visible
+        self.Freeze()
+        try:
+            for attr in self._PANELS:
+                if attr not in changed:
+                    continue
+                panel = getattr(self, attr)
+                if panel is None:
+                    if attr in visible:
+                        self._create_panel(attr)
+                    continue
+                panel.Show(attr in visible)
+                if attr in visible and getattr(panel, "dirty", False):
+                    panel.update_pane()
+            self.Layout()
+        finally:
+            self.Thaw()
+
+    def _create_panel(self, attr):
+        panel_class, sizer = self._panel_factories[attr]
+        panel = panel_class(self, wx.ID_ANY, translation_panel=self)
+        sizer.Add(panel, 3, wx.EXPAND, 0)
+        setattr(self, attr, panel)
+
     def show_project_panel(self):
-        self.panel_message_single.Hide()
-        self.panel_statistics.Hide()
-        self.panel_template.Hide()
-        self.panel_catalog.Hide()
-        self.panel_file_information.Hide()
-        self.panel_template_file_information.Hide()
-        self.panel_info.Hide()
-        self.panel_project.Show()
-        self.Layout()
+        self._switch_panels("project")
 
     def show_info_panel(self):
-        self.panel_message_single.Hide()
-        self.panel_statistics.Hide()
-        self.panel_template.Hide()
-        self.panel_catalog.Hide()
-        self.panel_file_information.Hide()
-        self.panel_template_file_information.Hide()
-        self.panel_info.Show()
-        self.panel_project.Hide()
-        self.Layout()
+        self._switch_panels("info")
 
     def show_message_panel(self):
-        self.panel_message_single.Show()
-        self.panel_statistics.Hide()
-        self.panel_template.Hide()
-        self.panel_catalog.Hide()
-        self.panel_file_information.Hide()
-        self.panel_template_file_information.Hide()
-        self.panel_info.Hide()
-        self.panel_project.Hide()
-        self.Layout()
+        self._switch_panels("message")
 
     def show_catalog_panel(self):
-        self.panel_message_single.Hide()
-        self.panel_statistics.Show()
-        self.panel_catalog.Show()
-        self.panel_template.Hide()
-        self.panel_file_information.Show()
-        self.panel_template_file_information.Hide()
-        self.panel_info.Hide()
-        self.panel_project.Hide()
-        self.Layout()
+        self._switch_panels("catalog")
 
     def show_template_panel(self):
-        self.panel_message_single.Hide()
-        self.panel_statistics.Hide()
-        self.panel_catalog.Hide()
-        self.panel_template.Show()
-        self.panel_file_information.Hide()
-        self.panel_template_file_information.Show()
-        self.panel_info.Hide()
-        self.panel_project.Hide()
-        self.Layout()
+        self._switch_panels("template")
 
     def on_tree_selection(self, event):
         if self.do_not_update:
             return
         try:
+            selections = self.tree.GetSelections()
+            # Enter in the message panel advances here, found once per selection.
+            self._next_selectable = (
+                self.tree.GetNextSibling(selections[-1]) if selections else None
+            )
             data = [
                 self.tree.GetItemData(item)
-                for item in self.tree.GetSelections()
+                for item in selections
                 if self.tree.GetItemData(item) is not None
             ]
-            print(data)
+            logger.debug("Selected %s", data)
             if len(data) > 0:
                 catalog, info = data[0]
+                selection = (id(catalog), info if isinstance(info, str) else id(info))
+                if selection == self._last_selection:
+                    return
+                self._last_selection = selection
                 if catalog is not None:
-                    for key, value in self.project.catalogs.items():
-                        if catalog is value:
-                            self.catalog = key
+                    self.catalog = self._catalog_index.get(id(catalog), self.catalog)
                 self.panel_message_single.selected_catalog = catalog
-                if isinstance(info, str):
-                    if info == "root":
-                        self.show_catalog_panel()
-                        self.panel_catalog.catalog = catalog
-                        self.panel_statistics.catalog = catalog
-                        self.panel_file_information.catalog = catalog
-
-                        self.panel_catalog.update_pane()
-                        self.panel_statistics.update_pane()
-                        self.panel_file_information.update_pane()
-                    elif info == "template":
-                        self.show_template_panel()
-                        self.panel_template_file_information.catalog = catalog
-                        self.panel_template.template = catalog
-
-                        self.panel_template.update_pane()
-                        self.panel_template_file_information.update_pane()
-                    elif info == "project":
-                        self.show_project_panel()
-                        self.panel_project.project = self.project
-
-                        self.panel_project.update_pane()
+                # Panel switch and pane updates paint once, when thawed.
+                self.Freeze()
+                try:
+                    if isinstance(info, str):
+                        if info == "root":
+                            self.show_catalog_panel()
+                            self.panel_catalog.catalog = catalog
+                            self.panel_statistics.catalog = catalog
+                            self.panel_file_information.catalog = catalog
+
+                            self.panel_catalog.update_pane()
+                            self.panel_statistics.update_pane()
+                            self.panel_file_information.update_pane()
+                        elif info == "template":
+                            self.show_template_panel()
+                            self.panel_template_file_information.catalog = catalog
+                            self.panel_template.template = catalog
+
+                            self.panel_template.update_pane()
+                            self.panel_template_file_information.update_pane()
+                        elif info == "project":
+                            self.show_project_panel()
+                            self.panel_project.project = self.project
+
+                            self.panel_project.update_pane()
+                        else:
+                            self.show_info_panel()
+                            self.panel_info.catalog = catalog
+                            self.panel_info.info = info
+
+                            self.panel_info.update_pane()
                     else:
-                        self.show_info_panel()
-                        self.panel_info.catalog = catalog
-                        self.panel_info.info = info
-
-                        self.panel_info.update_pane()
-                else:
-                    self.show_message_panel()
-                    self.panel_message_single.update_pane(info)
+                        self.show_message_panel()
+                        self.panel_message_single.update_pane(info)
+                finally:
+                    self.Thaw()
         except RuntimeError:
             pass
 
@@ -938,62 +1122,26 @@ class SingleMessagePanel(wx.Panel):
         self.text_comment = wx.TextCtrl(
             self, wx.ID_ANY, "", style=wx.TE_MULTILINE | wx.TE_READONLY
         )
-        self.text_comment.SetFont(
-            wx.Font(
-                14,
-                wx.FONTFAMILY_DEFAULT,
-                wx.FONTSTYLE_NORMAL,
-                wx.FONTWEIGHT_NORMAL,
-                0,
-                "Segoe UI",
-            )
-        )
+        self.text_comment.SetFont(_font(14))
         sizer_comment.Add(self.text_comment, 3, wx.EXPAND, 0)
 
         sizer_3 = wx.BoxSizer(wx.HORIZONTAL)
         sizer_comment.Add(sizer_3, 1, wx.EXPAND, 0)
 
         self.checkbox_fuzzy = wx.CheckBox(self, wx.ID_ANY, "Fuzzy")
-        self.checkbox_fuzzy.SetFont(
-            wx.Font(
-                15,
-                wx.FONTFAMILY_DEFAULT,
-                wx.FONTSTYLE_NORMAL,
-                wx.FONTWEIGHT_NORMAL,
-                0,
-                "Segoe UI",
-            )
-        )
+        self.checkbox_fuzzy.SetFont(_font(15))
         sizer_3.Add(self.checkbox_fuzzy, 0, 0, 0)
 
         self.text_original_text = wx.TextCtrl(
             self, wx.ID_ANY, "", style=wx.TE_MULTILINE | wx.TE_READONLY
         )
-        self.text_original_text.SetFont(
-            wx.Font(
-                14,
-                wx.FONTFAMILY_DEFAULT,
-                wx.FONTSTYLE_NORMAL,
-                wx.FONTWEIGHT_NORMAL,
-                0,
-                "Segoe UI",
-            )
-        )
+        self.text_original_text.SetFont(_font(14))
         sizer_comment.Add(self.text_original_text, 6, wx.EXPAND, 0)
 
         self.text_translated_text = wx.TextCtrl(
             self, wx.ID_ANY, "", style=wx.TE_MULTILINE | wx.TE_PROCESS_ENTER
         )
-        self.text_translated_text.SetFont(
-            wx.Font(
-                14,
-                wx.FONTFAMILY_DEFAULT,
-                wx.FONTSTYLE_NORMAL,
-                wx.FONTWEIGHT_NORMAL,
-                0,
-                "Segoe UI",
-            )
-        )
+        self.text_translated_text.SetFont(_font(14))
         sizer_comment.Add(self.text_translated_text, 6, wx.EXPAND, 0)
 
         self.SetSizer(sizer_comment)
@@ -1008,15 +1156,20 @@ class SingleMessagePanel(wx.Panel):
         self.selected_message = None
         self.selected_catalog = None
 
+        self._commit_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_commit_timer, self._commit_timer)
+
     def on_check_message_fuzzy(self, event=None):
+        self.flush_translation()
         if self.selected_message is not None:
             self.selected_message.fuzzy = self.checkbox_fuzzy.GetValue()
             self.selected_message.modified = True
-            self.translation_panel.message_revalidate(
+            self.translation_panel.schedule_revalidate(
                 self.selected_catalog, self.selected_message
             )
 
     def update_pane(self, message):
+        self.flush_translation()
         self.selected_message = None
 
         if message is not None:
@@ -1028,19 +1181,20 @@ class SingleMessagePanel(wx.Panel):
                 msgstr = ""
             comments = list(message.auto_comments)
             comments.extend(message.user_comments)
-            print(message.locations)
+            logger.debug("Locations %s", message.locations)
             # comments.extend(message.locations)
-            self.text_comment.SetValue("\n".join(comments))
-            self.text_original_text.SetValue(str(msgid))
-            self.text_translated_text.SetValue(str(msgstr))
+            _change_value(self.text_comment, "\n".join(comments))
+            _change_value(self.text_original_text, str(msgid))
+            _change_value(self.text_translated_text, str(msgstr))
             self.text_comment.Enable(True)
             self.text_original_text.Enable(True)
             self.text_translated_text.Enable(True)
-            self.checkbox_fuzzy.SetValue(message.fuzzy)
+            if self.checkbox_fuzzy.GetValue() != message.fuzzy:
+                self.checkbox_fuzzy.SetValue(message.fuzzy)
         else:
-            self.text_comment.SetValue("")
-            self.text_original_text.SetValue("")
-            self.text_translated_text.SetValue("")
+            _change_value(self.text_comment, "")
+            _change_value(self.text_original_text, "")
+            _change_value(self.text_translated_text, "")
             self.text_comment.Enable(False)
             self.text_original_text.Enable(False)
             self.text_translated_text.Enable(False)
@@ -1048,6 +1202,13 @@ class SingleMessagePanel(wx.Panel):
 
     def on_text_translated(self, event):
         if self.selected_message:
+            # Commit once typing pauses rather than on every keystroke.
+            self._commit_timer.StartOnce(150)
+
+    def on_commit_timer(self, event=None):
+        self._commit_timer.Stop()
+        if self.selected_message:
+            StatisticsPanel.invalidate(self.selected_catalog)
             if not self.selected_message.pluralizable:
                 self.selected_message.string = self.text_translated_text.GetValue()
                 self.selected_message.modified = True
@@ -1055,12 +1216,18 @@ class SingleMessagePanel(wx.Panel):
                 self.selected_message.string[0] = self.text_translated_text.GetValue()
                 self.selected_message.modified = True
 
+    def flush_translation(self):
+        """
+        Commit any pending translated text to the selected message immediately.
+        """
+        if self._commit_timer.IsRunning():
+            self.on_commit_timer()
+
     def on_text_enter(self, event):
-        t = None
-        for item in list(self.translation_panel.tree.GetSelections()):
-            t = self.translation_panel.tree.GetNextSibling(item)
+        self.flush_translation()
+        t = self.translation_panel._next_selectable
         if self.selected_message is not None and self.selected_catalog is not None:
-            self.translation_panel.message_revalidate(
+            self.translation_panel.schedule_revalidate(
                 self.selected_catalog, self.selected_message
             )
         if t is not None and t.IsOk():
@@ -1188,37 +1355,37 @@ class CatalogPanel(wx.Panel):
     def on_text_catalog_project_name(
         self, event
     ):  # wxGlade: CatalogPanel.<event_handler>
-        print("Event handler 'on_text_catalog_project_name' not implemented!")
+        logger.debug("Event handler 'on_text_catalog_project_name' not implemented!")
         event.Skip()
 
     def on_text_catalog_project_team(
         self, event
     ):  # wxGlade: CatalogPanel.<event_handler>
-        print("Event handler 'on_text_catalog_project_team' not implemented!")
+        logger.debug("Event handler 'on_text_catalog_project_team' not implemented!")
         event.Skip()
 
     def on_combo_catalog_language(self, event):  # wxGlade: CatalogPanel.<event_handler>
-        print("Event handler 'on_combo_catalog_language' not implemented!")
+        logger.debug("Event handler 'on_combo_catalog_language' not implemented!")
         event.Skip()
 
     def on_radio_catalog_plural(self, event):  # wxGlade: CatalogPanel.<event_handler>
-        print("Event handler 'on_radio_catalog_plural' not implemented!")
+        logger.debug("Event handler 'on_radio_catalog_plural' not implemented!")
         event.Skip()
 
     def on_text_catalog_custom_rules(
         self, event
     ):  # wxGlade: CatalogPanel.<event_handler>
-        print("Event handler 'on_text_catalog_custom_rules' not implemented!")
+        logger.debug("Event handler 'on_text_catalog_custom_rules' not implemented!")
         event.Skip()
 
     def on_combo_catalog_charset(self, event):  # wxGlade: CatalogPanel.<event_handler>
-        print("Event handler 'on_combo_catalog_charset' not implemented!")
+        logger.debug("Event handler 'on_combo_catalog_charset' not implemented!")
         event.Skip()
 
     def update_pane(self):
-        self.text_catalog_project_name.SetLabelText(self.catalog.project)
-        self.text_custom_rules.SetLabelText(str(self.catalog.plural_expr))
-        self.text_catalog_language_team.SetLabelText(self.catalog.language_team)
+        _change_value(self.text_catalog_project_name, self.catalog.project)
+        _change_value(self.text_custom_rules, str(self.catalog.plural_expr))
+        _change_value(self.text_catalog_language_team, self.catalog.language_team)
 
 
 class StatisticsPanel(wx.Panel):
@@ -1305,40 +1472,92 @@ class StatisticsPanel(wx.Panel):
         self.Layout()
         # end wxGlade
         self.catalog = None
+        self._generation = 0
 
-    def update_pane(self):
-
-        total = len(self.catalog._messages)
-        self.text_messages_total.SetLabelText(str(total))
-        translated = [
-            m
-            for m in self.catalog._messages.values()
-            if m.string != "" and m.string is not None
-        ]
-        trans = len(translated)
-        self.text_messages_translated.SetLabelText(str(trans))
-        self.gauge_messages.SetRange(total)
-        self.gauge_messages.SetValue(trans)
-
-        total_words = 0
-        trans_words = 0
-        for message in self.catalog._messages.values():
-            words = len(message.id.split(" "))
+    @staticmethod
+    def word_count(message):
+        """
+        Words in the msgid, cached on the message until its msgid changes.
+        """
+        msgid = message.id
+        cached = getattr(message, "word_count", None)
+        if cached is None or cached[0] is not msgid:
+            text = msgid if isinstance(msgid, str) else msgid[0]
+            cached = (msgid, text.count(" ") + 1 if text else 0)
+            message.word_count = cached
+        return cached[1]
+
+    def compute(self, catalog):
+        """
+        Message, translated, fuzzy and word totals of the catalog. Touches no widgets.
+        """
+        word_count = self.word_count
+        total = trans = fuzz = total_words = trans_words = 0
+        for message in list(catalog._messages.values()):
+            total += 1
+            words = word_count(message)
             total_words += words
-            if message.string is not None and message.string != "":
+            string = message.string
+            if string is not None and string != "":
+                trans += 1
                 trans_words += words
-        self.text_words_total.SetLabelText(str(total_words))
-        self.text_words_translated.SetLabelText(str(trans_words))
-        self.gauge_words.SetRange(total_words)
-        self.gauge_words.SetValue(trans_words)
+            if message.fuzzy:
+                fuzz += 1
+        return total, trans, fuzz, total_words, trans_words
+
+    @staticmethod
+    def invalidate(catalog):
+        """
+        Drop the cached statistics of catalog, its messages were changed.
+        """
+        if catalog is not None:
+            catalog.statistics = None
+            catalog.statistics_token = None
+
+    def apply(self, generation, result, catalog=None, token=None):
+        if catalog is not None and getattr(catalog, "statistics_token", None) is token:
+            # Not invalidated while counting, keep it for the next visit.
+            catalog.statistics = result
+        if not self or generation != self._generation:
+            return  # Panel destroyed, or a later update_pane superseded this one.
+        total, trans, fuzz, total_words, trans_words = result
+        self.Freeze()
+        try:
+            _change_value(self.text_messages_total, str(total))
+            _change_value(self.text_messages_translated, str(trans))
+            self.gauge_messages.SetRange(total)
+            self.gauge_messages.SetValue(trans)
+
+            _change_value(self.text_words_total, str(total_words))
+            _change_value(self.text_words_translated, str(trans_words))
+            self.gauge_words.SetRange(total_words)
+            self.gauge_words.SetValue(trans_words)
+
+            _change_value(self.text_fuzzy_total, str(total))
+            _change_value(self.text_fuzzy_translated, str(fuzz))
+            self.gauge_fuzzy.SetRange(total)
+            self.gauge_fuzzy.SetValue(fuzz)
+        finally:
+            self.Thaw()
+
+    def _compute_and_apply(self, generation, catalog, token):
+        wx.CallAfter(self.apply, generation, self.compute(catalog), catalog, token)
 
-        total = len(self.catalog._messages)
-        self.text_fuzzy_total.SetLabelText(str(total))
-        fuzzy = [m for m in self.catalog._messages.values() if m.fuzzy]
-        fuzz = len(fuzzy)
-        self.text_fuzzy_translated.SetLabelText(str(fuzz))
-        self.gauge_fuzzy.SetRange(total)
-        self.gauge_fuzzy.SetValue(fuzz)
+    def update_pane(self):
+        self._generation += 1
+        catalog = self.catalog
+        cached = getattr(catalog, "statistics", None)
+        if cached is not None:
+            self.apply(self._generation, cached)
+            return
+        # Counting runs on a worker thread, only the widget writes return to the GUI thread.
+        token = object()
+        catalog.statistics_token = token
+        threading.Thread(
+            target=self._compute_and_apply,
+            args=(self._generation, catalog, token),
+            daemon=True,
+        ).start()
 
 
 class FileInformationPanel(wx.Panel):
@@ -1383,19 +1602,39 @@ class FileInformationPanel(wx.Panel):
         self.Layout()
         # end wxGlade
         self.catalog = None
+        self._generation = 0
+        self._file_sizes = dict()  # filename -> size last read by _probe_file
+
+    def _probe_file(self, generation, filename):
+        try:
+            filesize = os.stat(filename).st_size
+        except OSError:
+            filesize = 0
+        wx.CallAfter(self._apply_probe, generation, filename, filesize)
+
+    def _apply_probe(self, generation, filename, filesize):
+        if not self:
+            return
+        self._file_sizes[filename] = filesize
+        if generation == self._generation:
+            _change_value(self.text_file_size, str(filesize))
 
     def update_pane(self):
+        self._generation += 1
         filename = self.catalog.filename
-        self.text_file_location.SetLabelText(str(filename))
-        filesize = 0
-        if filename is not None:
-            if os.path.exists(filename):
-                filesize = os.path.getsize(filename)
-        self.text_file_size.SetLabelText(str(filesize))
+        _change_value(self.text_file_location, str(filename))
         if filename is None or filename.endswith(".pot"):
-            self.text_file_type.SetLabelText("Gettext Portable Object Template")
+            _change_value(self.text_file_type, "Gettext Portable Object Template")
         else:
-            self.text_file_type.SetLabelText("Gettext Portable Object File")
+            _change_value(self.text_file_type, "Gettext Portable Object File")
+        if filename is None:
+            _change_value(self.text_file_size, "0")
+            return
+        # Show the last known size at once, the stat may be slow on network drives.
+        _change_value(self.text_file_size, str(self._file_sizes.get(filename, "")))
+        threading.Thread(
+            target=self._probe_file, args=(self._generation, filename), daemon=True
+        ).start()
 
 
 class TemplatePanel(wx.Panel):
@@ -1463,17 +1702,17 @@ class TemplatePanel(wx.Panel):
         self.template = None
 
     def on_text_template_name(self, event):  # wxGlade: TemplatePanel.<event_handler>
-        print("Event handler 'on_text_template_name' not implemented!")
+        logger.debug("Event handler 'on_text_template_name' not implemented!")
         event.Skip()
 
     def on_text_template_team(self, event):  # wxGlade: TemplatePanel.<event_handler>
-        print("Event handler 'on_text_template_team' not implemented!")
+        logger.debug("Event handler 'on_text_template_team' not implemented!")
         event.Skip()
 
     def on_combo_template_charset(
         self, event
     ):  # wxGlade: TemplatePanel.<event_handler>
-        print("Event handler 'on_combo_template_charset' not implemented!")
+        logger.debug("Event handler 'on_combo_template_charset' not implemented!")
         event.Skip()
 
     def update_pane(self):
@@ -1583,14 +1822,12 @@ class ProjectPanel(wx.Panel):
             self.text_template_structure,
         )
         # end wxGlade
-        self.text_project_name.SetValue(self.translation_panel.project.name)
-        self.combo_project_charset.SetSelection(self.translation_panel.project.charset)
-        self.text_project_pot_file.SetValue(
-            self.translation_panel.project.template_file
-        )
-        self.text_template_structure.SetValue(
-            self.translation_panel.project.catalog_file
-        )
+        project = self.translation_panel.project
+        self.text_project_name.SetValue(project.name)
+        self.combo_project_charset.SetSelection(project.charset)
+        self.text_project_pot_file.SetValue(project.template_file)
+        self.text_template_structure.SetValue(project.catalog_file)
+        self.dirty = False  # Set when update_pane is skipped while hidden.
 
     def on_project_open_directory(self, event):  # wxGlade: ProjectPanel.<event_handler>
         self.translation_panel.open_project_directory()
@@ -1614,21 +1851,26 @@ class ProjectPanel(wx.Panel):
         )
 
     def update_pane(self):
-        directory = self.translation_panel.project.directory
+        if not self.IsShown():
+            self.dirty = True  # Refreshed by _switch_panels when shown again.
+            return
+        self.dirty = False
+        project = self.translation_panel.project
+        directory = project.directory
         if directory is None:
             directory = ""
-        self.text_project_directory.SetValue(directory)
+        _change_value(self.text_project_directory, directory)
 
-        tem_file = self.translation_panel.project.template_file
-        self.text_project_pot_file.SetValue(tem_file)
+        tem_file = project.template_file
+        _change_value(self.text_project_pot_file, tem_file)
 
-        cat_file = self.translation_panel.project.catalog_file
-        self.text_template_structure.SetValue(cat_file)
+        cat_file = project.catalog_file
+        _change_value(self.text_template_structure, cat_file)
 
-        name = self.translation_panel.project.name
-        self.text_project_name.SetValue(self.translation_panel.project.name)
+        _change_value(self.text_project_name, project.name)
 
-        self.combo_project_charset.SetSelection(self.translation_panel.project.charset)
+        if self.combo_project_charset.GetSelection() != project.charset:
+            self.combo_project_charset.SetSelection(project.charset)
 
 
 class InfoPanel(wx.Panel):
@@ -1642,19 +1884,10 @@ class InfoPanel(wx.Panel):
             wx.StaticBox(self, wx.ID_ANY, "Info"), wx.VERTICAL
         )
 
-        self.text_information_description = wx.TextCtrl(
-            self, wx.ID_ANY, "", style=wx.TE_MULTILINE | wx.TE_READONLY
-        )
-        self.text_information_description.SetFont(
-            wx.Font(
-                14,
-                wx.FONTFAMILY_DEFAULT,
-                wx.FONTSTYLE_NORMAL,
-                wx.FONTWEIGHT_NORMAL,
-                0,
-                "Segoe UI",
-            )
+        self.text_information_description = wx.StaticText(
+            self, wx.ID_ANY, "", style=wx.ST_NO_AUTORESIZE
         )
+        self.text_information_description.SetFont(_font(14))
 
         sizer_main.Add(self.text_information_description, 1, wx.EXPAND, 0)
 
@@ -1669,30 +1902,75 @@ class InfoPanel(wx.Panel):
         # end wxGlade
         self.info = None
         self.catalog = None
+        self._last_info = None  # Info the description and buttons were built for.
+        self._description = ""
+        self._buttons = []  # Operation buttons, in sizer order, extras hidden.
+        self._commands = dict()  # button id -> command
+        self.Bind(wx.EVT_BUTTON, self.on_command)
+        self.text_information_description.Bind(wx.EVT_SIZE, self.on_description_size)
+
+    def on_description_size(self, event):
+        self._wrap_description()
+        event.Skip()
+
+    def _wrap_description(self):
+        """
+        StaticText does not wrap by itself, rewrap the description to the current width.
+        """
+        label = self.text_information_description
+        label.SetLabelText(self._description)
+        width = label.GetSize().width
+        if width > 0:
+            label.Wrap(width)
+
+    def on_command(self, event):
+        command = self._commands.get(event.GetId())
+        if command is None:
+            event.Skip()
+            return
+        self.translation_panel.tree_populate_catalog(self.catalog)
+        command(self.translation_panel.tree, self.catalog, self.translation_panel)
+        # Commands add, move and delete messages, the cached totals are stale.
+        StatisticsPanel.invalidate(self.catalog)
 
     def update_pane(self):
-        def as_event(funct):
-            def specific(event=None):
-                funct(self.translation_panel.tree, self.catalog, self.translation_panel)
-
-            return specific
-
-        if self.info is not None:
-            data = INTERFACE.get(self.info)
-            desc = data["description"]
-            self.text_information_description.SetValue(desc)
-
-            self.sizer_operations.Clear(True)
-            for cmd in data["commands"]:
-                button = wx.Button(self, wx.ID_ANY, cmd["name"])
-                self.Bind(wx.EVT_BUTTON, as_event(cmd["command"]), button)
-                self.sizer_operations.Add(button, 0, 0, 0)
+        if self.info is None:
+            return
+        if self.info == self._last_info:
+            # INTERFACE is read-only, and on_command reads self.catalog when clicked.
+            return
+        self._last_info = self.info
+        desc, commands = INTERFACE.get(self.info)
+        # Thawing repaints once, after the buttons are relabelled and laid out.
+        self.Freeze()
+        try:
+            if desc != self._description:
+                self._description = desc
+                self._wrap_description()
+
+            # Buttons are reused across infos, only missing ones are created.
+            buttons = self._buttons
+            self._commands.clear()
+            for i, (name, command) in enumerate(commands):
+                if i < len(buttons):
+                    button = buttons[i]
+                    button.SetLabel(name)
+                    button.Show()
+                else:
+                    button = wx.Button(self, wx.ID_ANY, name)
+                    buttons.append(button)
+                    self.sizer_operations.Add(button, 0, 0, 0)
+                self._commands[button.GetId()] = command
+            for button in buttons[len(commands) :]:
+                button.Hide()
             self.Layout()
-        self.Update()
-        self.Refresh()
+        finally:
+            self.Thaw()
 
 
 class PoboyWindow(wx.Frame):
+    _translations = None  # Cached by _get_translations.
+
     def __init__(self, *args, **kwds):
         # begin wxGlade: MyFrame.__init__
         kwds["style"] = kwds.get("style", 0) | wx.DEFAULT_FRAME_STYLE
@@ -1700,6 +1978,7 @@ class PoboyWindow(wx.Frame):
         self.SetSize((1200, 800))
         self.language = None
         self.locale = None
+        self._menu_id_to_language = dict()
 
         self.panel = TranslationPanel(self, wx.ID_ANY)
 
@@ -1709,33 +1988,40 @@ class PoboyWindow(wx.Frame):
         self.SetMenuBar(self.main_menubar)
 
         _icon = wx.NullIcon
-        _icon.CopyFromBitmap(icons8_translation_50.GetBitmap())
+        _icon.CopyFromBitmap(icon_bitmap())
         self.SetIcon(_icon)
         self.SetTitle(_("POboy"))
         self.Layout()
         # end wxGlade
 
+    @classmethod
+    def _get_translations(cls):
+        """
+        Language codes with a poboy catalog, scanned once after load_catalogs set the paths.
+        """
+        if cls._translations is None:
+            tl = wx.FileTranslationsLoader()
+            cls._translations = frozenset(tl.GetAvailableTranslations("poboy"))
+        return cls._translations
+
     def add_language_menu(self):
-        tl = wx.FileTranslationsLoader()
-        trans = tl.GetAvailableTranslations("poboy")
+        trans = self._get_translations()
 
         wxglade_tmp_menu = wx.Menu()
-        i = 0
-        for lang in supported_languages:
+        for i, lang in enumerate(supported_languages):
             language_code, language_name, language_index = lang
             m = wxglade_tmp_menu.Append(wx.ID_ANY, language_name, "", wx.ITEM_RADIO)
             if i == self.language:
                 m.Check(True)
-
-            def language_update(q):
-                return lambda e: self.load_language(q)
-
-            self.Bind(wx.EVT_MENU, language_update(i), id=m.GetId())
+            self._menu_id_to_language[m.GetId()] = i
+            self.Bind(wx.EVT_MENU, self.on_menu_language, id=m.GetId())
             if language_code not in trans and i != 0:
                 m.Enable(False)
-            i += 1
         self.main_menubar.Append(wxglade_tmp_menu, _("Languages"))
 
+    def on_menu_language(self, event):
+        self.load_language(self._menu_id_to_language[event.GetId()])
+
     def load_language(self, lang):
         try:
             language_code, language_name, language_index = supported_languages[lang]
@@ -1743,9 +2029,8 @@ class PoboyWindow(wx.Frame):
             return
         self.language = lang
 
-        if self.locale:
-            assert sys.getrefcount(self.locale) <= 2
-            del self.locale
+        # The previous wx.Locale must be gone before the next one is created.
+        self.locale = None
         self.locale = wx.Locale(language_index)
         # wxWidgets is broken. IsOk()==false and pops up error dialog, but it translates fine!
         if self.locale.IsOk() or "linux" in sys.platform:
@@ -1764,21 +2049,28 @@ class PoboyApp(wx.App):
         return True
 
     def load_catalogs(self):
+        paths = []
         try:  # pyinstaller internal location
-            _resource_path = os.path.join(sys._MEIPASS, "locale")
-            wx.Locale.AddCatalogLookupPathPrefix(_resource_path)
-        except Exception:
+            paths.append(os.path.join(sys._MEIPASS, "locale"))
+        except AttributeError:
             pass
 
         try:  # Mac py2app resource
-            _resource_path = os.path.join(os.environ["RESOURCEPATH"], "locale")
-            wx.Locale.AddCatalogLookupPathPrefix(_resource_path)
-        except Exception:
+            paths.append(os.path.join(os.environ["RESOURCEPATH"], "locale"))
+        except KeyError:
             pass
 
-        wx.Locale.AddCatalogLookupPathPrefix("locale")
+        paths.append("locale")
 
         # Default Locale, prepended. Check this first.
         basepath = os.path.abspath(os.path.dirname(sys.argv[0]))
-        localedir = os.path.join(basepath, "locale")
-        wx.Locale.AddCatalogLookupPathPrefix(localedir)
+        paths.append(os.path.join(basepath, "locale"))
+
+        # Every prefix is probed on each catalog lookup, register each real directory once.
+        seen = set()
+        for path in paths:
+            key = os.path.abspath(path)
+            if key in seen or not os.path.isdir(path):
+                continue
+            seen.add(key)
+            wx.Locale.AddCatalogLookupPathPrefix(path)